@@ -0,0 +1,147 @@
+"""Optional cuStateVec backend applying gate matrices to CUDA state vectors.
+
+`custatevecApplyMatrix` applies a (controlled) gate in a single kernel instead of going
+through the general tensor contraction in `apply_operator`.
+cuQuantum is imported lazily on first use and is not a dependency of pyqtorch:
+if it is not installed, `can_apply` returns False and `apply_operator` is used.
+"""
+
+from __future__ import annotations
+
+from functools import lru_cache
+from logging import getLogger
+from typing import Any
+
+import torch
+from torch import Tensor
+
+from pyqtorch.utils import is_plain_tensor
+
+logger = getLogger(__name__)
+
+_HANDLES: dict[int, int] = {}
+
+
+@lru_cache(maxsize=1)
+def _custatevec() -> Any:
+    """Returns the `cuquantum` module, or None if it is not installed."""
+    try:
+        import cuquantum  # type: ignore[import-not-found]
+        from cuquantum import custatevec  # noqa: F401
+    except ImportError:
+        return None
+    logger.debug("Using cuStateVec to apply gates on CUDA states.")
+    return cuquantum
+
+
+def is_available() -> bool:
+    """Whether cuQuantum is installed."""
+    return _custatevec() is not None
+
+
+def _handle(device: torch.device) -> int:
+    """Returns the cuStateVec handle of `device`, creating it on first use."""
+    index = device.index if device.index is not None else torch.cuda.current_device()
+    if index not in _HANDLES:
+        with torch.cuda.device(index):
+            _HANDLES[index] = _custatevec().custatevec.create()
+    return _HANDLES[index]
+
+
+def can_apply(state: Tensor, operator: Tensor) -> bool:
+    """Whether `operator` can be applied to `state` with cuStateVec.
+
+    Only unbatched complex states which are not part of an autograd graph are supported,
+    outside of `torch.compile` and functorch transforms.
+
+    Arguments:
+        state: State of shape [2 for _ in range(n_qubits)] + [batch_size].
+        operator: Operator of shape [2**n_support, 2**n_support, batch_size].
+
+    Returns:
+        True if `apply` supports `state` and `operator`.
+    """
+    return (
+        state.is_cuda
+        and state.size(-1) == 1
+        and operator.size(-1) == 1
+        and state.dtype in (torch.complex64, torch.complex128)
+        and not operator.is_sparse
+        and not (
+            torch.is_grad_enabled() and (state.requires_grad or operator.requires_grad)
+        )
+        and is_plain_tensor(state)
+        and is_available()
+    )
+
+
+def apply(
+    state: Tensor,
+    operator: Tensor,
+    targets: tuple[int, ...],
+    controls: tuple[int, ...] = (),
+) -> Tensor:
+    """Applies `operator` on `targets`, conditioned on all `controls` being 1.
+
+    Arguments:
+        state: State of shape [2 for _ in range(n_qubits)] + [1].
+        operator: Operator of shape [2**len(targets), 2**len(targets), 1].
+        targets: Qubits the operator acts on.
+        controls: Control qubits.
+
+    Returns:
+        State after applying 'operator'.
+    """
+    cuquantum = _custatevec()
+    cusv = cuquantum.custatevec
+    n_qubits = state.ndim - 1
+    if state.dtype == torch.complex64:
+        data_type, compute_type = (
+            cuquantum.cudaDataType.CUDA_C_32F,
+            cuquantum.ComputeType.COMPUTE_32F,
+        )
+    else:
+        data_type, compute_type = (
+            cuquantum.cudaDataType.CUDA_C_64F,
+            cuquantum.ComputeType.COMPUTE_64F,
+        )
+    out = state.clone(memory_format=torch.contiguous_format)
+    matrix = operator[..., 0].to(state.dtype).resolve_conj().contiguous()
+    # Qubit 0 is the most significant index bit and
+    # the last target is the least significant bit of the matrix index.
+    target_bits = [n_qubits - 1 - q for q in reversed(targets)]
+    control_bits = [n_qubits - 1 - q for q in controls]
+    handle = _handle(state.device)
+    cusv.set_stream(handle, torch.cuda.current_stream(state.device).cuda_stream)
+    workspace_size = cusv.apply_matrix_get_workspace_size(
+        handle,
+        data_type,
+        n_qubits,
+        matrix.data_ptr(),
+        data_type,
+        cusv.MatrixLayout.ROW,
+        0,
+        len(target_bits),
+        len(control_bits),
+        compute_type,
+    )
+    workspace = torch.empty(workspace_size, dtype=torch.uint8, device=state.device)
+    cusv.apply_matrix(
+        handle,
+        out.data_ptr(),
+        data_type,
+        n_qubits,
+        matrix.data_ptr(),
+        data_type,
+        cusv.MatrixLayout.ROW,
+        0,
+        target_bits,
+        len(target_bits),
+        control_bits,
+        0,
+        len(control_bits),
+        compute_type,
+        workspace.data_ptr() if workspace_size > 0 else 0,
+        workspace_size,
+    )
+    return out
@@ -0,0 +1,124 @@
+"""Numba kernels applying fixed single-qubit gates to CPU state vectors.
+
+The kernels work in place on a state viewed as a [2**n_qubits, batch_size] array.
+For a qubit stored at bit `bit` of the row index, every pair of rows (lo, hi)
+differing only in that bit is obtained from a counter `i` over 2**(n_qubits-1)
+values by inserting a zero (lo) or a one (hi) at position `bit`.
+
+The kernels are compiled on first use and cached on disk by Numba,
+so only the first process using them pays for the compilation.
+
+Numba is an optional dependency: when it is not installed, `fast_kernel` returns None
+and Primitive falls back to `apply_operator`.
+"""
+
+from __future__ import annotations
+
+from functools import partial
+from typing import Callable
+
+import torch
+from torch import Tensor
+
+from pyqtorch.utils import is_plain_tensor
+
+try:
+    from numba import njit, prange
+
+    NUMBA_AVAILABLE = True
+except ImportError:
+    NUMBA_AVAILABLE = False
+
+FastKernel = Callable[[Tensor, int], Tensor]
+
+if NUMBA_AVAILABLE:
+
+    @njit(parallel=True, fastmath=True, cache=True)
+    def _apply_x(state, bit):  # type: ignore[no-untyped-def]
+        mask = (1 << bit) - 1
+        for i in prange(state.shape[0] // 2):
+            lo = ((i >> bit) << (bit + 1)) | (i & mask)
+            hi = lo | (1 << bit)
+            for b in range(state.shape[1]):
+                amp = state[lo, b]
+                state[lo, b] = state[hi, b]
+                state[hi, b] = amp
+
+    @njit(parallel=True, fastmath=True, cache=True)
+    def _apply_diagonal(state, bit, d0, d1):  # type: ignore[no-untyped-def]
+        mask = (1 << bit) - 1
+        for i in prange(state.shape[0] // 2):
+            lo = ((i >> bit) << (bit + 1)) | (i & mask)
+            hi = lo | (1 << bit)
+            for b in range(state.shape[1]):
+                state[lo, b] *= d0
+                state[hi, b] *= d1
+
+    @njit(parallel=True, fastmath=True, cache=True)
+    def _apply_dense(state, bit, m00, m01, m10, m11):  # type: ignore[no-untyped-def]
+        mask = (1 << bit) - 1
+        for i in prange(state.shape[0] // 2):
+            lo = ((i >> bit) << (bit + 1)) | (i & mask)
+            hi = lo | (1 << bit)
+            for b in range(state.shape[1]):
+                amp_lo = state[lo, b]
+                amp_hi = state[hi, b]
+                state[lo, b] = m00 * amp_lo + m01 * amp_hi
+                state[hi, b] = m10 * amp_lo + m11 * amp_hi
+
+
+def _run(kernel: Callable, args: tuple, state: Tensor, target: int) -> Tensor:
+    """Applies `kernel` on a copy of `state` for the qubit `target`.
+
+    Arguments:
+        kernel: Numba kernel to run.
+        args: Matrix entries passed to the kernel.
+        state: State of shape [2 for _ in range(n_qubits)] + [batch_size].
+        target: Qubit to apply the gate on.
+
+    Returns:
+        State after applying the gate.
+    """
+    out = state.detach().clone(memory_format=torch.contiguous_format)
+    # Qubit 0 is the most significant bit of the row index.
+    kernel(out.numpy().reshape(-1, out.size(-1)), out.ndim - 2 - target, *args)
+    return out
+
+
+def can_apply(state: Tensor) -> bool:
+    """Whether a kernel from `fast_kernel` can be applied to `state`.
+
+    Only complex CPU states which are not part of an autograd graph are supported.
+
+    Arguments:
+        state: State of shape [2 for _ in range(n_qubits)] + [batch_size].
+
+    Returns:
+        True if the kernels support `state`.
+    """
+    return (
+        state.device.type == "cpu"
+        and state.dtype in (torch.complex64, torch.complex128)
+        and not (state.requires_grad and torch.is_grad_enabled())
+        and is_plain_tensor(state)
+    )
+
+
+def fast_kernel(matrix: Tensor) -> FastKernel | None:
+    """Selects a Numba kernel for a fixed single-qubit gate.
+
+    Arguments:
+        matrix: The [2, 2] matrix of the gate.
+
+    Returns:
+        A function applying the gate to a state for a given target qubit,
+        or None if Numba is not available or `matrix` is not a single-qubit gate.
+    """
+    if not NUMBA_AVAILABLE or matrix.shape != (2, 2) or matrix.is_sparse:
+        return None
+    (m00, m01), (m10, m11) = matrix.tolist()
+    if m00 == m11 == 0 and m01 == m10 == 1:
+        return partial(_run, _apply_x, ())
+    if m01 == m10 == 0:
+        return partial(_run, _apply_diagonal, (m00, m11))
+    return partial(_run, _apply_dense, (m00, m01, m10, m11))
@@ -10,18 +10,20 @@ import torch
 from torch import Tensor
 from torch.nn import Module, ModuleList, ParameterDict
 
-from pyqtorch.apply import apply_operator
+from pyqtorch.apply import apply_operator, apply_operator_real
 from pyqtorch.circuit import Sequence
 from pyqtorch.matrices import _dagger
 from pyqtorch.primitive import Primitive
 from pyqtorch.utils import (
     ATOL,
+    REAL_STATE_DTYPES,
     Operator,
     State,
     StrEnum,
     inner_prod,
     is_diag,
     operator_to_sparse_diagonal,
+    split_complex,
 )
 
 BATCH_DIM = 2
@@ -120,6 +122,12 @@ class Scale(Sequence):
         Returns:
             The transformed state.
         """
+        if state.dtype in REAL_STATE_DTYPES:
+            return apply_operator_real(
+                state,
+                *split_complex(self.unitary(values)),
+                self.operations[0].qubit_support,
+            )
         return apply_operator(
             state, self.unitary(values), self.operations[0].qubit_support
         )
@@ -303,7 +311,7 @@ class Observable(Sequence):
         Returns:
             The transformed state.
         """
-        for op in self.operations:
+        for op in self._forward_ops:
             state = op(state, values)
         return state
 
@@ -355,8 +363,11 @@ class DiagonalObservable(Primitive):
             operator = operator_to_sparse_diagonal(hamiltonian)
         else:
             operator = torch.diag(hamiltonian).reshape(-1, 1)
-        super().__init__(operator, operations.qubit_support[0])
-        self.qubit_support = operations.qubit_support
+        super().__init__(
+            operator,
+            operations.qubit_support[0],
+            qubit_support=operations.qubit_support,
+        )
         self.n_qubits = n_qubits
 
     def run(self, state: Tensor, values: dict[str, Tensor]) -> Tensor:
@@ -374,6 +385,11 @@ class DiagonalObservable(Primitive):
         Returns:
             The transformed state.
         """
+        if state.dtype in REAL_STATE_DTYPES:
+            raise TypeError(
+                f"DiagonalObservable does not support states of dtype {state.dtype}. "
+                "Use a complex state or an Observable instead."
+            )
         return torch.einsum(
             "ij,ib->ib", self.pauli, state.flatten(start_dim=0, end_dim=-2)
         ).reshape([2] * self.n_qubits + [state.shape[-1]])
@@ -476,7 +492,7 @@ class HamiltonianEvolution(Sequence):
             assert (
                 qubit_support is not None
             ), "When using a Tensor generator, please pass a qubit_support."
-            if len(generator.shape) < 3:
+            if generator.ndim < 3:
                 generator = generator.unsqueeze(2)
             generator = [Primitive(generator, target=-1)]
             self.generator_type = GeneratorType.TENSOR
@@ -550,16 +566,12 @@ class HamiltonianEvolution(Sequence):
         """
         hamiltonian = values[self.generator_symbol]
         # add batch dim
-        if len(hamiltonian.shape) == 2:
+        if hamiltonian.ndim == 2:
             return hamiltonian.unsqueeze(2)
         # cases when the batchdim is at index 0 instead of 2
-        if len(hamiltonian.shape) == 3 and (
-            hamiltonian.shape[0] != hamiltonian.shape[1]
-        ):
+        if hamiltonian.ndim == 3 and (hamiltonian.shape[0] != hamiltonian.shape[1]):
             return torch.transpose(hamiltonian, 0, 2)
-        if len(hamiltonian.shape) == 4 and (
-            hamiltonian.shape[0] != hamiltonian.shape[1]
-        ):
+        if hamiltonian.ndim == 4 and (hamiltonian.shape[0] != hamiltonian.shape[1]):
             return torch.permute(hamiltonian.squeeze(3), (1, 2, 0))
         return hamiltonian
 
@@ -612,11 +624,17 @@ class HamiltonianEvolution(Sequence):
             values[self.time] if isinstance(self.time, str) else self.time
         )  # If `self.time` is a string / hence, a Parameter,
         # we expect the user to pass it in the `values` dict
+        if state.dtype in REAL_STATE_DTYPES:
+            return apply_operator_real(
+                state,
+                *split_complex(evolve(hamiltonian, time_evolution)),
+                self.qubit_support,
+            )
         return apply_operator(
             state=state,
             operator=evolve(hamiltonian, time_evolution),
             qubits=self.qubit_support,
-            n_qubits=len(state.size()) - 1,
+            n_qubits=state.ndim - 1,
             batch_size=max(hamiltonian.shape[BATCH_DIM], len(time_evolution)),
         )
 
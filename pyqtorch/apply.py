@@ -1,12 +1,13 @@
 from __future__ import annotations
 
 from string import ascii_letters as ABC
+from typing import Callable
 
 from numpy import array, log2
 from numpy.typing import NDArray
-from torch import Tensor, einsum
+from torch import Tensor, einsum, stack
 
-from pyqtorch.utils import promote_operator
+from pyqtorch.utils import REAL_STATE_DTYPES, promote_operator  # noqa: F401
 
 ABC_ARRAY: NDArray = array(list(ABC))
 
@@ -17,6 +18,7 @@ def apply_operator(
     qubits: tuple[int, ...] | list[int],
     n_qubits: int | None = None,
     batch_size: int | None = None,
+    controls: tuple[int, ...] | list[int] | None = None,
 ) -> Tensor:
     """Applies an operator, i.e. a single tensor of shape [2, 2, ...], on a given state
        of shape [2 for _ in range(n_qubits)] for a given set of (target and control) qubits.
@@ -34,13 +36,25 @@ def apply_operator(
         qubits: Tuple of qubits on which to apply the 'operator' to.
         n_qubits: The number of qubits of the full system.
         batch_size: Batch size of either state and or operators.
+        controls: Control qubits. If given, 'operator' only acts on 'qubits' and is
+            applied to the slice of 'state' where all control qubits are 1.
 
     Returns:
         State after applying 'operator'.
     """
     qubits = list(qubits)
     if n_qubits is None:
-        n_qubits = len(state.size()) - 1
+        n_qubits = state.ndim - 1
+    if controls:
+        return _apply_controlled(
+            state,
+            lambda state, qubits, n_qubits: apply_operator(
+                state, operator, qubits, n_qubits
+            ),
+            qubits,
+            list(controls),
+            n_qubits,
+        )
     if batch_size is None:
         batch_size = state.size(-1)
     n_support = len(qubits)
@@ -58,6 +72,85 @@ def apply_operator(
     return einsum(f"{operator_dims},{in_state_dims}->{out_state_dims}", operator, state)
 
 
+def apply_operator_real(
+    state: Tensor,
+    operator_re: Tensor,
+    operator_im: Tensor,
+    qubits: tuple[int, ...] | list[int],
+    controls: tuple[int, ...] | list[int] | None = None,
+) -> Tensor:
+    """Applies a complex operator given by its real and imaginary parts on a state
+       stored as a real tensor of shape [2 for _ in range(n_qubits)] + [batch_size, 2],
+       i.e. in the layout of `torch.view_as_real` for a state of the usual shape.
+
+       Only real arithmetic is used, with four real contractions, which allows
+       simulating with low precision dtypes like float16 and bfloat16.
+
+    Arguments:
+        state: Real and imaginary parts of the state to operate on.
+        operator_re: Real part of the operator.
+        operator_im: Imaginary part of the operator.
+        qubits: Tuple of qubits on which to apply the operator to.
+        controls: Control qubits, see `apply_operator`.
+
+    Returns:
+        Real and imaginary parts of the state after applying the operator.
+    """
+    operator_re, operator_im = operator_re.to(state.dtype), operator_im.to(state.dtype)
+
+    def apply(state: Tensor, qubits: list[int], n_qubits: int) -> Tensor:
+        state_re, state_im = state[..., 0], state[..., 1]
+        out_re = apply_operator(state_re, operator_re, qubits, n_qubits)
+        out_re = out_re - apply_operator(state_im, operator_im, qubits, n_qubits)
+        out_im = apply_operator(state_re, operator_im, qubits, n_qubits)
+        out_im = out_im + apply_operator(state_im, operator_re, qubits, n_qubits)
+        return stack((out_re, out_im), dim=-1)
+
+    n_qubits = state.ndim - 2
+    if controls:
+        return _apply_controlled(state, apply, list(qubits), list(controls), n_qubits)
+    return apply(state, list(qubits), n_qubits)
+
+
+def _apply_controlled(
+    state: Tensor,
+    apply: Callable[[Tensor, list[int], int], Tensor],
+    qubits: list[int],
+    controls: list[int],
+    n_qubits: int,
+) -> Tensor:
+    """Applies an operator on 'qubits' to the slice of 'state' where all 'controls' are 1.
+
+    The rest of the state is left untouched, so the full controlled operator
+    never has to be materialized.
+
+    Arguments:
+        state: State to operate on.
+        apply: Applies the operator to a state given its target qubits and
+            number of qubits.
+        qubits: Target qubits.
+        controls: Control qubits.
+        n_qubits: The number of qubits of the full system.
+
+    Returns:
+        State after applying the controlled operator.
+    """
+    control_slice = tuple(1 if i in controls else slice(None) for i in range(n_qubits))
+    # Target dimensions shift down by the number of control dimensions sliced before them.
+    sliced_qubits = [q - sum(c < q for c in controls) for q in qubits]
+    controlled_state = apply(
+        state[control_slice], sliced_qubits, n_qubits - len(controls)
+    )
+    batch_size = controlled_state.size(n_qubits - len(controls))
+    if state.size(n_qubits) != batch_size:
+        state = state.expand(
+            *state.shape[:n_qubits], batch_size, *state.shape[n_qubits + 1 :]
+        )
+    out = state.clone()
+    out[control_slice] = controlled_state
+    return out
+
+
 def operator_product(op1: Tensor, op2: Tensor, target: int) -> Tensor:
     """
     Compute the product of two operators.
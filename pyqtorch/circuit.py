@@ -14,11 +14,18 @@ from torch import device as torch_device
 from torch import dtype as torch_dtype
 from torch.nn import Module, ModuleList, ParameterDict
 
-from pyqtorch.apply import apply_operator
+from pyqtorch.apply import REAL_STATE_DTYPES, apply_operator, apply_operator_real
 from pyqtorch.matrices import IMAT, add_batch_dim
 from pyqtorch.parametric import RX, RY, Parametric
-from pyqtorch.primitive import CNOT, Primitive
-from pyqtorch.utils import State, product_state, zero_state
+from pyqtorch.primitive import CNOT, NVTX_ENABLED, Primitive, _has_hooks
+from pyqtorch.utils import (
+    DensityMatrix,
+    State,
+    operator_kron,
+    product_state,
+    split_complex,
+    zero_state,
+)
 
 logger = getLogger(__name__)
 
@@ -43,12 +50,64 @@ def pre_backward_hook(*args, **kwargs) -> None:  # type: ignore[no-untyped-def]
     torch.cuda.nvtx.range_push("QuantumCircuit.backward")
 
 
+# Largest number of qubits fused into a single operator, i.e. a 16x16 matrix.
+MAX_FUSED_QUBITS = 4
+
+
+class FusedPrimitives:
+    """Consecutive instances of the same fixed single-qubit gate acting on distinct qubits.
+
+    They are applied as a single Kronecker product operator over all their qubits,
+    so the state is contracted once instead of once per gate.
+    """
+
+    def __init__(self, operations: list[Primitive]):
+        self.operations = operations
+        self.qubits = tuple(op.qubit_support[0] for op in operations)
+        self._pauli: Tensor | None = None
+        self._operator: Tensor | None = None
+
+    def __call__(
+        self, state: State, values: dict[str, Tensor] | ParameterDict | None = None
+    ) -> State:
+        # Hooks registered after the run was fused still have to run for every gate.
+        if (
+            isinstance(state, DensityMatrix)
+            or state.dtype in REAL_STATE_DTYPES
+            or any(_has_hooks(op) for op in self.operations)
+        ):
+            for op in self.operations:
+                state = op(state, values)
+            return state
+        # The pooled matrix only changes when the gates are moved with `to`.
+        pauli = self.operations[0].pauli
+        if self._operator is None or pauli is not self._pauli:
+            self._pauli = pauli
+            self._operator = reduce(
+                operator_kron, [self.operations[0].unitary()] * len(self.qubits)
+            )
+        return apply_operator(state, self._operator, self.qubits)
+
+
+def _is_skipped(op: Module) -> bool:
+    """Whether `op` is an identity without hooks, which does not need to be run."""
+    return getattr(op, "is_identity", False) and not _has_hooks(op)
+
+
+def _is_fusable(op: Primitive) -> bool:
+    return (
+        op._pauli_key is not None and len(op.qubit_support) == 1 and not _has_hooks(op)
+    )
+
+
 class Sequence(Module):
     """A generic container for pyqtorch operations"""
 
     def __init__(self, operations: list[Module]):
         super().__init__()
         self.operations = ModuleList(operations)
+        self._forward_ops_cache: tuple[tuple, list[Module | FusedPrimitives]]
+        self._forward_ops_cache = ((), [])
         self._device = torch_device("cpu")
         self._dtype = complex128
         if len(self.operations) > 0:
@@ -88,6 +147,58 @@ class Sequence(Module):
     def qubit_support(self) -> tuple:
         return self._qubit_support
 
+    @property
+    def _forward_ops(self) -> list[Module | FusedPrimitives]:
+        """The operations run by `forward`.
+
+        They are rebuilt whenever `operations` is modified
+        or hooks are added to or removed from an identity.
+        """
+        key = tuple(self.operations), tuple(map(_is_skipped, self.operations))
+        cached_key, forward_ops = self._forward_ops_cache
+        if key != cached_key:
+            forward_ops = self._build_forward_ops(key[0])
+            self._forward_ops_cache = (key, forward_ops)
+        return forward_ops
+
+    def _build_forward_ops(
+        self, operations: tuple[Module, ...]
+    ) -> list[Module | FusedPrimitives]:
+        """Builds the operations run by `forward`.
+
+        Identities without hooks are skipped and runs of the same fixed single-qubit
+        gate on distinct qubits are fused, unless NVTX markers are requested for every gate.
+        """
+        ops: list[Module | FusedPrimitives] = [
+            op for op in operations if not _is_skipped(op)
+        ]
+        if NVTX_ENABLED:
+            return ops
+        forward_ops: list[Module | FusedPrimitives] = []
+        run: list[Primitive] = []
+
+        def close_run() -> None:
+            if len(run) > 1:
+                forward_ops.append(FusedPrimitives(run.copy()))
+            else:
+                forward_ops.extend(run)
+            run.clear()
+
+        for op in ops:
+            if not (isinstance(op, Primitive) and _is_fusable(op)):
+                close_run()
+                forward_ops.append(op)
+                continue
+            if run and (
+                op._pauli_key != run[0]._pauli_key
+                or op.qubit_support[0] in (r.qubit_support[0] for r in run)
+                or len(run) >= MAX_FUSED_QUBITS
+            ):
+                close_run()
+            run.append(op)
+        close_run()
+        return forward_ops
+
     def __iter__(self) -> Iterator:
         return iter(self.operations)
 
@@ -100,7 +211,7 @@ class Sequence(Module):
     def forward(
         self, state: State, values: dict[str, Tensor] | ParameterDict = {}
     ) -> State:
-        for op in self.operations:
+        for op in self._forward_ops:
             state = op(state, values)
         return state
 
@@ -245,7 +356,8 @@ class Merge(Sequence):
             )
 
     def forward(self, state: Tensor, values: dict[str, Tensor] | None = None) -> Tensor:
-        batch_size = state.shape[-1]
+        is_real_state = state.dtype in REAL_STATE_DTYPES
+        batch_size = state.shape[-2] if is_real_state else state.shape[-1]
         if values:
             batch_size = max(
                 batch_size,
@@ -258,10 +370,16 @@ class Merge(Sequence):
                     )
                 ),
             )
+        if is_real_state:
+            return apply_operator_real(
+                state,
+                *split_complex(self.unitary(values, batch_size)),
+                self.qubit_support,
+            )
         return apply_operator(
             state,
             self.unitary(values, batch_size),
-            self.qubits,
+            self.qubit_support,
         )
 
     def unitary(self, values: dict[str, Tensor] | None, batch_size: int) -> Tensor:
@@ -102,7 +102,9 @@ def _controlled(
     unitary: torch.Tensor, batch_size: int, n_control_qubits: int = 1
 ) -> torch.Tensor:
     _controlled: torch.Tensor = (
-        torch.eye(2 ** (n_control_qubits + 1), dtype=unitary.dtype)
+        torch.eye(
+            2 ** (n_control_qubits + 1), dtype=unitary.dtype, device=unitary.device
+        )
         .unsqueeze(2)
         .repeat(1, 1, batch_size)
     )
@@ -7,8 +7,10 @@ from torch import Tensor
 
 from pyqtorch.matrices import (
     DEFAULT_MATRIX_DTYPE,
+    IMAT,
     OPERATIONS_DICT,
     _controlled,
+    _dagger,
     _jacobian,
     _unitary,
 )
@@ -26,12 +28,14 @@ class Parametric(Primitive):
     """
 
     n_params = 1
+    identity: Tensor
 
     def __init__(
         self,
         generator_name: str,
         target: int,
         param_name: str | int | float | torch.Tensor = "",
+        qubit_support: tuple[int, ...] | None = None,
     ):
         """Initializes Parametric.
 
@@ -39,12 +43,15 @@ class Parametric(Primitive):
             generator_name: Name of the operation.
             target: Target qubit.
             param_name: Name of parameters.
+            qubit_support: Qubits acted on, defaults to the target qubit.
         """
-        super().__init__(OPERATIONS_DICT[generator_name], target)
-        self.register_buffer("identity", OPERATIONS_DICT["I"])
+        super().__init__(
+            OPERATIONS_DICT[generator_name], target, qubit_support=qubit_support
+        )
+        self.register_buffer("identity", IMAT, persistent=False)
         self.param_name = param_name
 
-        def parse_values(values: dict[str, Tensor] | Tensor = dict()) -> Tensor:
+        def parse_values(values: dict[str, Tensor] | Tensor | None = None) -> Tensor:
             """The legacy way of using parametric gates:
                The Parametric gate received a string as a 'param_name' and performs a
                a lookup in the passed `values` dict for to retrieve the torch.Tensor passed
@@ -58,7 +65,7 @@ class Parametric(Primitive):
             # self.param_name will be a str
             return Parametric._expand_values(values[self.param_name])  # type: ignore[index]
 
-        def parse_tensor(values: dict[str, Tensor] | Tensor = dict()) -> Tensor:
+        def parse_tensor(values: dict[str, Tensor] | Tensor | None = None) -> Tensor:
             """Functional version of the Parametric gate:
                In case the user did not pass a `param_name`,
                pyqtorch assumes `values` will be a torch.Tensor instead of a dict.
@@ -71,7 +78,7 @@ class Parametric(Primitive):
             # self.param_name will be ""
             return Parametric._expand_values(values)
 
-        def parse_constant(values: dict[str, Tensor] | Tensor = dict()) -> Tensor:
+        def parse_constant(values: dict[str, Tensor] | Tensor | None = None) -> Tensor:
             """Fix a the parameter of a Parametric Gate to a numeric constant
                if the user passed a numeric input for the `param_name`.
 
@@ -107,7 +114,7 @@ class Parametric(Primitive):
         Returns:
             Hash value
         """
-        return hash(self.qubit_support) + hash(self.param_name)
+        return self._hash + hash(self.param_name)
 
     @staticmethod
     def _expand_values(values: Tensor) -> Tensor:
@@ -119,9 +126,9 @@ class Parametric(Primitive):
             Values of parameters expanded.
 
         """
-        return values.unsqueeze(0) if len(values.size()) == 0 else values
+        return values.unsqueeze(0) if values.ndim == 0 else values
 
-    def unitary(self, values: dict[str, Tensor] | Tensor = dict()) -> Operator:
+    def unitary(self, values: dict[str, Tensor] | Tensor | None = None) -> Operator:
         """
         Get the corresponding unitary.
 
@@ -135,7 +142,34 @@ class Parametric(Primitive):
         batch_size = len(thetas)
         return _unitary(thetas, self.pauli, self.identity, batch_size)
 
-    def jacobian(self, values: dict[str, Tensor] | Tensor = dict()) -> Operator:
+    def dagger(self, values: dict[str, Tensor] | Tensor | None = None) -> Operator:
+        """
+        Get the corresponding unitary of the dagger.
+
+        Arguments:
+            values: Parameter value.
+
+        Returns:
+            The unitary representation of the dagger.
+        """
+        return _dagger(self.unitary(values))
+
+    def real_unitary(
+        self, values: dict[str, Tensor] | Tensor | None = None
+    ) -> tuple[Operator, Operator]:
+        """
+        Get the real and imaginary parts of the corresponding unitary.
+
+        Arguments:
+            values: Parameter value.
+
+        Returns:
+            The real and imaginary parts of the unitary representation.
+        """
+        unitary = self.unitary(values)
+        return unitary.real, unitary.imag
+
+    def jacobian(self, values: dict[str, Tensor] | Tensor | None = None) -> Operator:
         """
         Get the corresponding unitary of the jacobian.
 
@@ -257,7 +291,7 @@ class PHASE(Parametric):
         """
         super().__init__("I", target, param_name)
 
-    def unitary(self, values: dict[str, Tensor] = dict()) -> Operator:
+    def unitary(self, values: dict[str, Tensor] | None = None) -> Operator:
         """
         Get the corresponding unitary.
 
@@ -273,7 +307,7 @@ class PHASE(Parametric):
         batch_mat[1, 1, :] = torch.exp(1.0j * thetas).unsqueeze(0).unsqueeze(1)
         return batch_mat
 
-    def jacobian(self, values: dict[str, Tensor] = dict()) -> Operator:
+    def jacobian(self, values: dict[str, Tensor] | None = None) -> Operator:
         """
         Get the corresponding unitary of the jacobian.
 
@@ -320,8 +354,7 @@ class ControlledRotationGate(Parametric):
             param_name: Name of parameters.
         """
         self.control = control if isinstance(control, tuple) else (control,)
-        super().__init__(gate, target, param_name)
-        self.qubit_support = self.control + (self.target,)  # type: ignore[operator]
+        super().__init__(gate, target, param_name, self.control + (target,))
         # In this class, target is always an int but herit from Parametric and Primitive that:
         # target : int | tuple[int,...]
 
@@ -335,7 +368,7 @@ class ControlledRotationGate(Parametric):
             f"control: {self.control}, target:{(self.target,)}, param:{self.param_name}"
         )
 
-    def unitary(self, values: dict[str, Tensor] = dict()) -> Operator:
+    def unitary(self, values: dict[str, Tensor] | None = None) -> Operator:
         """
         Get the corresponding unitary.
 
@@ -350,7 +383,7 @@ class ControlledRotationGate(Parametric):
         mat = _unitary(thetas, self.pauli, self.identity, batch_size)
         return _controlled(mat, batch_size, len(self.control))
 
-    def jacobian(self, values: dict[str, Tensor] = dict()) -> Operator:
+    def jacobian(self, values: dict[str, Tensor] | None = None) -> Operator:
         """
         Get the corresponding unitary of the jacobian.
 
@@ -460,7 +493,7 @@ class CPHASE(ControlledRotationGate):
         """
         super().__init__("I", control, target, param_name)
 
-    def unitary(self, values: dict[str, Tensor] = dict()) -> Operator:
+    def unitary(self, values: dict[str, Tensor] | None = None) -> Operator:
         """
         Get the corresponding unitary.
 
@@ -476,7 +509,7 @@ class CPHASE(ControlledRotationGate):
         mat[1, 1, :] = torch.exp(1.0j * thetas).unsqueeze(0).unsqueeze(1)
         return _controlled(mat, batch_size, len(self.control))
 
-    def jacobian(self, values: dict[str, Tensor] = dict()) -> Operator:
+    def jacobian(self, values: dict[str, Tensor] | None = None) -> Operator:
         """
         Get the corresponding unitary of the jacobian.
 
@@ -563,7 +596,7 @@ class U(Parametric):
             "d", torch.tensor([[0, 0], [0, 1]], dtype=DEFAULT_MATRIX_DTYPE).unsqueeze(2)
         )
 
-    def unitary(self, values: dict[str, Tensor] = dict()) -> Operator:
+    def unitary(self, values: dict[str, Tensor] | None = None) -> Operator:
         """
         Get the corresponding unitary.
 
@@ -575,8 +608,8 @@ class U(Parametric):
         """
         phi, theta, omega = list(
             map(
-                lambda t: t.unsqueeze(0) if len(t.size()) == 0 else t,
-                [values[self.phi], values[self.theta], values[self.omega]],
+                lambda t: t.unsqueeze(0) if t.ndim == 0 else t,
+                [values[self.phi], values[self.theta], values[self.omega]],  # type: ignore[index]
             )
         )
         batch_size = len(theta)
@@ -592,7 +625,7 @@ class U(Parametric):
         d = self.d.repeat(1, 1, batch_size) * cos_t * torch.conj(t_plus)
         return a - b + c + d
 
-    def jacobian(self, values: dict[str, Tensor] = {}) -> Operator:
+    def jacobian(self, values: dict[str, Tensor] | None = None) -> Operator:
         """
         Get the corresponding unitary of the jacobian.
 
@@ -620,7 +653,9 @@ class U(Parametric):
             RZ(self.qubit_support[0], self.omega),
         ]
 
-    def jacobian_decomposed(self, values: dict[str, Tensor] = dict()) -> list[Operator]:
+    def jacobian_decomposed(
+        self, values: dict[str, Tensor] | None = None
+    ) -> list[Operator]:
         """
         Get the corresponding unitary decomposition of the jacobian.
 
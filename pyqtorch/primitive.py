@@ -1,57 +1,166 @@
 from __future__ import annotations
 
-import logging
+import os
 from logging import getLogger
-from typing import Any
+from typing import Any, Callable, MutableMapping, Tuple
+from weakref import WeakValueDictionary
 
 import numpy as np
 import torch
 from torch import Tensor
-
-from pyqtorch.apply import apply_operator, operator_product
+from torch.nn.modules import module as torch_module
+
+from pyqtorch import _custatevec_backend as custatevec
+from pyqtorch import _fast_apply as fast_apply
+from pyqtorch.apply import (
+    REAL_STATE_DTYPES,
+    apply_operator,
+    apply_operator_real,
+    operator_product,
+)
 from pyqtorch.matrices import (
+    CSWAPMAT,
+    DEFAULT_MATRIX_DTYPE,
+    HMAT,
     IMAT,
+    NMAT,
     OPERATIONS_DICT,
+    SDAGGERMAT,
+    SMAT,
+    SWAPMAT,
+    TMAT,
+    XMAT,
+    YMAT,
+    ZMAT,
     _controlled,
     _dagger,
 )
-from pyqtorch.utils import DensityMatrix, product_state
+from pyqtorch.utils import DensityMatrix, State, split_complex
 
 logger = getLogger(__name__)
 
+PoolKey = Tuple[str, torch.device, torch.dtype]
+
+# Static gate matrices are shared by all instances of a gate,
+# with one copy per device and dtype.
+_PAULI_POOL: dict[PoolKey, Tensor] = {}
+# Projectors and full controlled matrices can be large,
+# so they are only shared while some gate holds them.
+_WEAK_PAULI_POOL: WeakValueDictionary[PoolKey, Tensor] = WeakValueDictionary()
+_PROJECTOR_KEY_PREFIX = "PROJ_"
+
+
+def _pool(pauli_key: str) -> MutableMapping[PoolKey, Tensor]:
+    """Returns the pool holding the matrices of `pauli_key`."""
+    if pauli_key.startswith(_PROJECTOR_KEY_PREFIX):
+        return _WEAK_PAULI_POOL
+    return _PAULI_POOL
+
+
+def _pool_get(pauli_key: str, pauli: Tensor) -> Tensor:
+    """Returns the pooled matrix for `pauli_key` on the device and dtype of `pauli`.
+
+    If no such matrix is pooled yet, `pauli` itself becomes the shared copy.
+    """
+    return _pool(pauli_key).setdefault((pauli_key, pauli.device, pauli.dtype), pauli)
+
+
+# Per-gate NVTX markers fire on every gate application,
+# so they are only installed on explicit request.
+NVTX_ENABLED: bool = os.environ.get("PYQ_NVTX", "").strip().lower() in (
+    "1",
+    "true",
+    "yes",
+)
+
 
 def forward_hook(*args, **kwargs) -> None:  # type: ignore[no-untyped-def]
+    if not torch.cuda.is_available():
+        return
     torch.cuda.nvtx.range_pop()
 
 
 def pre_forward_hook(*args, **kwargs) -> None:  # type: ignore[no-untyped-def]
+    if not torch.cuda.is_available():
+        return
     torch.cuda.nvtx.range_push("Primitive.forward")
 
 
 def backward_hook(*args, **kwargs) -> None:  # type: ignore[no-untyped-def]
+    if not torch.cuda.is_available():
+        return
     torch.cuda.nvtx.range_pop()
 
 
 def pre_backward_hook(*args, **kwargs) -> None:  # type: ignore[no-untyped-def]
+    if not torch.cuda.is_available():
+        return
     torch.cuda.nvtx.range_push("Primitive.backward")
 
 
+# Constant matrices which were saved in the state dict of previous versions.
+_LEGACY_STATE_DICT_KEYS = ("pauli", "identity")
+
+
+def _drop_legacy_state(
+    module: Primitive, state_dict: dict[str, Any], prefix: str, *args: Any
+) -> None:
+    """Drops the constant matrices from state dicts saved by previous versions.
+
+    They are rebuilt by the constructor and are not part of the state dict anymore.
+    """
+    for key in _LEGACY_STATE_DICT_KEYS:
+        state_dict.pop(prefix + key, None)
+
+
 class Primitive(torch.nn.Module):
-    def __init__(self, pauli: Tensor, target: int | tuple[int, ...]) -> None:
+    # Identities leave the state untouched and are skipped by Sequence.
+    is_identity: bool = False
+    # Buffers, or references to the pooled matrices, see `_register_derived_buffers`.
+    pauli: Tensor
+    _pauli_u: Tensor
+    pauli_dagger: Tensor
+    pauli_re: Tensor
+    pauli_im: Tensor
+
+    def __init__(
+        self,
+        pauli: Tensor,
+        target: int | tuple[int, ...],
+        pauli_key: str | None = None,
+        qubit_support: tuple[int, ...] | None = None,
+    ) -> None:
         super().__init__()
         self.target: int | tuple[int, ...] = target
 
-        self.qubit_support: tuple[int, ...] = (
-            (target,) if isinstance(target, int) else target
+        # Subclasses acting on more qubits than `target` pass their full support.
+        if qubit_support is None:
+            if isinstance(target, np.integer):
+                qubit_support = (target.item(),)
+            else:
+                qubit_support = (target,) if isinstance(target, int) else target
+        self.qubit_support: tuple[int, ...] = qubit_support
+        # The support is fixed, so its hash is computed once.
+        self._hash = hash(qubit_support)
+        # Gates with a `pauli_key` hold a reference to the pooled matrix
+        # instead of owning a buffer, see `_apply`.
+        self._pauli_key = pauli_key
+        if pauli_key is None:
+            self.register_buffer("pauli", pauli, persistent=False)
+        else:
+            self.pauli = _pool_get(pauli_key, pauli)
+        # Fixed single-qubit gates are applied with a Numba kernel on CPU if available.
+        self._fast_kernel = (
+            fast_apply.fast_kernel(pauli) if pauli_key is not None else None
         )
-        if isinstance(target, np.integer):
-            self.qubit_support = (target.item(),)
-        self.register_buffer("pauli", pauli)
+        self._register_derived_buffers()
+        self._register_load_state_dict_pre_hook(_drop_legacy_state, with_module=True)
+        self._compiled_forward: Callable[..., State] | None = None
         self._device = self.pauli.device
         self._dtype = self.pauli.dtype
 
-        if logger.isEnabledFor(logging.DEBUG):
-            # When Debugging let's add logging and NVTX markers
+        if NVTX_ENABLED:
+            # When profiling let's add NVTX markers
             # WARNING: incurs performance penalty
             self.register_forward_hook(forward_hook, always_call=True)
             self.register_full_backward_hook(backward_hook)
@@ -59,16 +168,16 @@ class Primitive(torch.nn.Module):
             self.register_full_backward_pre_hook(pre_backward_hook)
 
     def __hash__(self) -> int:
-        return hash(self.qubit_support)
+        return self._hash
 
     def extra_repr(self) -> str:
         return f"{self.qubit_support}"
 
-    def unitary(self, values: dict[str, Tensor] | Tensor = dict()) -> Tensor:
-        return self.pauli.unsqueeze(2) if len(self.pauli.shape) == 2 else self.pauli
+    def unitary(self, values: dict[str, Tensor] | Tensor | None = None) -> Tensor:
+        return self._pauli_u
 
     def forward(
-        self, state: Tensor, values: dict[str, Tensor] | Tensor = dict()
+        self, state: Tensor, values: dict[str, Tensor] | Tensor | None = None
     ) -> Tensor:
         if isinstance(state, DensityMatrix):
             # TODO: fix error type int | tuple[int, ...] expected "int"
@@ -80,13 +189,18 @@ class Primitive(torch.nn.Module):
                     self.target,  # type: ignore [arg-type]
                 )
             )
-        else:
-            return apply_operator(
-                state, self.unitary(values), self.qubit_support, len(state.size()) - 1
-            )
-
-    def dagger(self, values: dict[str, Tensor] | Tensor = dict()) -> Tensor:
-        return _dagger(self.unitary(values))
+        qubit_support = self.qubit_support
+        if state.dtype in REAL_STATE_DTYPES:
+            return apply_operator_real(state, *self.real_unitary(values), qubit_support)
+        if self._fast_kernel is not None and fast_apply.can_apply(state):
+            return self._fast_kernel(state, qubit_support[0])
+        unitary = self.unitary(values)
+        if custatevec.can_apply(state, unitary):
+            return custatevec.apply(state, unitary, qubit_support)
+        return apply_operator(state, unitary, qubit_support, state.ndim - 1)
+
+    def dagger(self, values: dict[str, Tensor] | Tensor | None = None) -> Tensor:
+        return self.pauli_dagger
 
     @property
     def device(self) -> torch.device:
@@ -96,6 +210,64 @@ class Primitive(torch.nn.Module):
     def dtype(self) -> torch.dtype:
         return self._dtype
 
+    def _apply(self, fn: Callable[[Tensor], Tensor], recurse: bool = True) -> Primitive:
+        super()._apply(fn, recurse)
+        if self._pauli_key is not None:
+            self.pauli = _pool_get(self._pauli_key, fn(self.pauli))
+        self._register_derived_buffers()
+        self._compiled_forward = None
+        return self
+
+    def _register_derived_buffers(self) -> None:
+        """Derives the tensors computed once from the fixed matrix.
+
+        They are rebuilt from `pauli` after `to` rather than converted themselves,
+        e.g. a complex dtype must not be applied to the real and imaginary parts.
+        """
+        pauli = self.pauli
+        # The batched view returned by `unitary`, kept to avoid a new view per call.
+        unitary = pauli.unsqueeze(2) if pauli.ndim == 2 else pauli
+        self.register_buffer("_pauli_u", unitary, persistent=False)
+        self.register_buffer("pauli_dagger", _dagger(unitary), persistent=False)
+        if self._pauli_key is not None:
+            # Real and imaginary parts for states stored as real tensors, see `forward`.
+            # They are views of the pooled matrix, so gates sharing it share them too.
+            # Others split their matrix on use.
+            unitary_re, unitary_im = split_complex(unitary)
+            self.register_buffer("pauli_re", unitary_re, persistent=False)
+            self.register_buffer("pauli_im", unitary_im, persistent=False)
+
+    def real_unitary(
+        self, values: dict[str, Tensor] | Tensor | None = None
+    ) -> tuple[Tensor, Tensor]:
+        """Returns the real and imaginary parts of the unitary.
+
+        Arguments:
+            values: Parameter values, unused for fixed gates.
+
+        Returns:
+            The real and imaginary parts of the unitary.
+        """
+        if self._pauli_key is not None:
+            return self.pauli_re, self.pauli_im
+        return split_complex(self.unitary(values))
+
+    def compile_forward(self) -> Callable[..., State]:
+        """Compiles `forward` with `torch.compile` for static shapes.
+
+        This is opt-in and mostly pays off for small states, where the Python overhead
+        of a call dominates. The compiled function is memoized until the gate is moved
+        with `to`.
+
+        Returns:
+            The compiled `forward`.
+        """
+        if self._compiled_forward is None:
+            self._compiled_forward = torch.compile(
+                self.forward, dynamic=False, mode="reduce-overhead"
+            )
+        return self._compiled_forward
+
     def to(self, *args: Any, **kwargs: Any) -> Primitive:
         super().to(*args, **kwargs)
         self._device = self.pauli.device
@@ -103,7 +275,10 @@ class Primitive(torch.nn.Module):
         return self
 
     def tensor(
-        self, values: dict[str, Tensor] = {}, n_qubits: int = 1, diagonal: bool = False
+        self,
+        values: dict[str, Tensor] | None = None,
+        n_qubits: int = 1,
+        diagonal: bool = False,
     ) -> Tensor:
         if diagonal:
             raise NotImplementedError
@@ -127,101 +302,201 @@ class Primitive(torch.nn.Module):
         return mat
 
 
-class X(Primitive):
+def _has_hooks(module: torch.nn.Module) -> bool:
+    """Whether calling `module` runs any hooks, registered on it or globally."""
+    return bool(
+        module._forward_hooks
+        or module._forward_pre_hooks
+        or module._backward_hooks
+        or module._backward_pre_hooks
+        or torch_module._global_forward_hooks
+        or torch_module._global_forward_pre_hooks
+        or torch_module._global_backward_hooks
+        or torch_module._global_backward_pre_hooks
+    )
+
+
+class _StaticPrimitive(Primitive):
+    """Primitive with a fixed matrix and no parameters.
+
+    Calling it goes straight to `forward` and skips the hook dispatch of
+    `torch.nn.Module.__call__`, unless hooks are registered on the gate or globally,
+    e.g. the NVTX markers enabled with PYQ_NVTX or a profiler.
+    """
+
+    def __call__(
+        self, state: Tensor, values: dict[str, Tensor] | Tensor | None = None
+    ) -> Tensor:
+        if _has_hooks(self):
+            return super().__call__(state, values)
+        return self.forward(state, values)
+
+
+class X(_StaticPrimitive):
     def __init__(self, target: int):
-        super().__init__(OPERATIONS_DICT["X"], target)
+        super().__init__(XMAT, target, pauli_key="X")
 
 
-class Y(Primitive):
+class Y(_StaticPrimitive):
     def __init__(self, target: int):
-        super().__init__(OPERATIONS_DICT["Y"], target)
+        super().__init__(YMAT, target, pauli_key="Y")
 
 
-class Z(Primitive):
+class Z(_StaticPrimitive):
     def __init__(self, target: int):
-        super().__init__(OPERATIONS_DICT["Z"], target)
+        super().__init__(ZMAT, target, pauli_key="Z")
+
 
+class I(_StaticPrimitive):  # noqa: E742
+    is_identity = True
 
-class I(Primitive):  # noqa: E742
     def __init__(self, target: int):
-        super().__init__(OPERATIONS_DICT["I"], target)
+        super().__init__(IMAT, target, pauli_key="I")
 
-    def forward(self, state: Tensor, values: dict[str, Tensor] = dict()) -> Tensor:
+    def forward(self, state: Tensor, values: dict[str, Tensor] | None = None) -> Tensor:
         return state
 
 
-class H(Primitive):
+class H(_StaticPrimitive):
     def __init__(self, target: int):
-        super().__init__(OPERATIONS_DICT["H"], target)
+        super().__init__(HMAT, target, pauli_key="H")
 
 
-class T(Primitive):
+class T(_StaticPrimitive):
     def __init__(self, target: int):
-        super().__init__(OPERATIONS_DICT["T"], target)
+        super().__init__(TMAT, target, pauli_key="T")
 
 
-class S(Primitive):
+class S(_StaticPrimitive):
     def __init__(self, target: int):
-        super().__init__(OPERATIONS_DICT["S"], target)
+        super().__init__(SMAT, target, pauli_key="S")
 
 
-class SDagger(Primitive):
+class SDagger(_StaticPrimitive):
     def __init__(self, target: int):
-        super().__init__(OPERATIONS_DICT["SDAGGER"], target)
+        super().__init__(SDAGGERMAT, target, pauli_key="SDAGGER")
 
 
-class Projector(Primitive):
+class Projector(_StaticPrimitive):
     def __init__(self, qubit_support: int | tuple[int, ...], ket: str, bra: str):
         support = (qubit_support,) if isinstance(qubit_support, int) else qubit_support
         if len(ket) != len(bra):
             raise ValueError("Input ket and bra bitstrings must be of same length.")
-        ket_state = product_state(ket).flatten()
-        bra_state = product_state(bra).flatten()
-        super().__init__(OPERATIONS_DICT["PROJ"](ket_state, bra_state), support[-1])
-        # Override the attribute in AbstractOperator.
-        self.qubit_support = support
+        # Projectors are pooled like the other static gates, so each |ket><bra|
+        # is only built once.
+        pauli_key = f"{_PROJECTOR_KEY_PREFIX}{ket}_{bra}"
+        mat = _WEAK_PAULI_POOL.get(
+            (pauli_key, torch.device("cpu"), DEFAULT_MATRIX_DTYPE)
+        )
+        if mat is None:
+            # |ket><bra| has a single nonzero entry, so write it directly
+            # instead of taking the outer product of two product states.
+            dim = 1 << len(ket)
+            mat = torch.zeros((dim, dim), dtype=DEFAULT_MATRIX_DTYPE, device="cpu")
+            mat[int(ket, 2), int(bra, 2)] = 1.0
+        super().__init__(mat, support[-1], pauli_key=pauli_key, qubit_support=support)
 
 
-class N(Primitive):
+class N(_StaticPrimitive):
     def __init__(self, target: int):
-        super().__init__(OPERATIONS_DICT["N"], target)
+        super().__init__(NMAT, target, pauli_key="N")
 
 
-class SWAP(Primitive):
+class SWAP(_StaticPrimitive):
     def __init__(self, control: int, target: int):
-        super().__init__(OPERATIONS_DICT["SWAP"], target)
         self.control = (control,) if isinstance(control, int) else control
-        self.qubit_support = self.control + (target,)
+        super().__init__(
+            SWAPMAT,
+            target,
+            pauli_key="SWAP",
+            qubit_support=self.control + (target,),
+        )
 
 
-class CSWAP(Primitive):
+class CSWAP(_StaticPrimitive):
     def __init__(self, control: int | tuple[int, ...], target: tuple[int, ...]):
         if not isinstance(target, tuple) or len(target) != 2:
             raise ValueError("Target qubits must be a tuple with two qubits")
-        super().__init__(OPERATIONS_DICT["CSWAP"], target)
         self.control = (control,) if isinstance(control, int) else control
-        self.target = target
-        self.qubit_support = self.control + self.target
+        super().__init__(
+            CSWAPMAT,
+            target,
+            pauli_key="CSWAP",
+            qubit_support=self.control + target,
+        )
 
     def extra_repr(self) -> str:
         return f"control:{self.control}, target:{self.target}"
 
 
-class ControlledOperationGate(Primitive):
+# Below this number of controls, contracting the full controlled matrix is faster than
+# applying the base gate to the slice of the state where all controls are 1, which
+# needs an extra copy of the state.
+MIN_SLICED_CONTROLS = 2
+
+
+class ControlledOperationGate(_StaticPrimitive):
     def __init__(self, gate: str, control: int | tuple[int, ...], target: int):
         self.control = (control,) if isinstance(control, int) else control
-        mat = OPERATIONS_DICT[gate]
-        mat = _controlled(
-            unitary=mat.unsqueeze(2),
-            batch_size=1,
-            n_control_qubits=len(self.control),
-        ).squeeze(2)
-        super().__init__(mat, target)
-        self.qubit_support = self.control + (self.target,)  # type: ignore[operator]
+        # Only the base gate is stored, the controls are handled when applying it.
+        super().__init__(
+            OPERATIONS_DICT[gate],
+            target,
+            pauli_key=gate,
+            qubit_support=self.control + (target,),
+        )
+        self._controlled_unitary: Tensor | None = None
+        self._controlled_dagger: Tensor | None = None
 
     def extra_repr(self) -> str:
         return f"control:{self.control}, target:{(self.target,)}"
 
+    def _apply(
+        self, fn: Callable[[Tensor], Tensor], recurse: bool = True
+    ) -> ControlledOperationGate:
+        super()._apply(fn, recurse)
+        self._controlled_unitary = None
+        self._controlled_dagger = None
+        return self
+
+    def unitary(self, values: dict[str, Tensor] | Tensor | None = None) -> Tensor:
+        # The full matrix is only built when requested, e.g. by the adjoint method,
+        # and then shared by the gates with the same base gate and number of controls.
+        if self._controlled_unitary is None:
+            n_controls = len(self.control)
+            key = (
+                f"C{n_controls}_{self._pauli_key}",
+                self.pauli.device,
+                self.pauli.dtype,
+            )
+            matrix = _WEAK_PAULI_POOL.get(key)
+            if matrix is None:
+                matrix = _controlled(Primitive.unitary(self), 1, n_controls)
+                _WEAK_PAULI_POOL[key] = matrix
+            self._controlled_unitary = matrix
+        return self._controlled_unitary
+
+    def dagger(self, values: dict[str, Tensor] | Tensor | None = None) -> Tensor:
+        if self._controlled_dagger is None:
+            self._controlled_dagger = _dagger(self.unitary())
+        return self._controlled_dagger
+
+    def forward(
+        self, state: Tensor, values: dict[str, Tensor] | Tensor | None = None
+    ) -> Tensor:
+        if isinstance(state, DensityMatrix):
+            return super().forward(state, values)
+        targets = (self.target,)
+        if state.dtype in REAL_STATE_DTYPES:
+            re, im = self.pauli_re, self.pauli_im
+            return apply_operator_real(state, re, im, targets, controls=self.control)  # type: ignore[arg-type]
+        base = Primitive.unitary(self)
+        if custatevec.can_apply(state, base):
+            return custatevec.apply(state, base, targets, self.control)  # type: ignore[arg-type]
+        if len(self.control) < MIN_SLICED_CONTROLS:
+            return apply_operator(state, self.unitary(), self.qubit_support)
+        return apply_operator(state, base, targets, controls=self.control)  # type: ignore[arg-type]
+
 
 class CNOT(ControlledOperationGate):
     def __init__(self, control: int | tuple[int, ...], target: int):
@@ -10,18 +10,66 @@ from typing import Any, Callable, Sequence
 
 import torch
 from torch import Tensor
+from torch.autograd import forward_ad
 
 from pyqtorch.matrices import DEFAULT_MATRIX_DTYPE, DEFAULT_REAL_DTYPE
 
 State = Tensor
 Operator = Tensor
 
+# Low precision dtypes for which states are stored as real tensors
+# in the layout of `torch.view_as_real`, see `pyqtorch.apply.apply_operator_real`.
+REAL_STATE_DTYPES = (torch.float16, torch.bfloat16)
+
 ATOL = 1e-06
 RTOL = 0.0
 GRADCHECK_ATOL = 1e-06
 
 logger = getLogger(__name__)
 
+# Neither is available in all torch versions, in which case they cannot be active.
+_is_compiling: Callable[[], bool] = getattr(
+    getattr(torch, "compiler", None), "is_compiling", lambda: False
+)
+_are_functorch_transforms_active: Callable[[], bool] = getattr(
+    torch._C, "_are_functorch_transforms_active", lambda: False
+)
+
+
+def is_plain_tensor(tensor: Tensor) -> bool:
+    """Whether the memory of `tensor` can be accessed directly by external kernels.
+
+    This excludes sparse tensors, tensors traced by `torch.compile`,
+    tensors wrapped by functorch transforms like `torch.vmap`
+    and dual tensors of forward-mode AD, whose tangent would not be propagated.
+
+    Arguments:
+        tensor: The tensor to check.
+
+    Returns:
+        True if `tensor` is a dense tensor backed by its own storage.
+    """
+    return (
+        tensor.layout == torch.strided
+        and not _is_compiling()
+        and not _are_functorch_transforms_active()
+        and forward_ad.unpack_dual(tensor).tangent is None
+    )
+
+
+def split_complex(tensor: Tensor) -> tuple[Tensor, Tensor]:
+    """Returns the real and imaginary parts of a possibly real tensor.
+
+    Arguments:
+        tensor: The tensor to split.
+
+    Returns:
+        The real and imaginary parts, as views for complex tensors.
+    """
+    if tensor.is_complex():
+        return tensor.real, tensor.imag
+    return tensor, torch.zeros_like(tensor)
+
 
 def inner_prod(bra: Tensor, ket: Tensor) -> Tensor:
     """
@@ -38,7 +86,11 @@ def inner_prod(bra: Tensor, ket: Tensor) -> Tensor:
         logger.debug("Inner prod calculation")
         torch.cuda.nvtx.range_push("inner_prod")
 
-    n_qubits = len(bra.size()) - 1
+    if bra.dtype in REAL_STATE_DTYPES:
+        # The sum is accumulated in single precision.
+        bra = torch.view_as_complex(bra.float().contiguous())
+        ket = torch.view_as_complex(ket.float().contiguous())
+    n_qubits = bra.ndim - 1
     bra = bra.reshape((2**n_qubits, bra.size(-1)))
     ket = ket.reshape((2**n_qubits, ket.size(-1)))
     res = torch.einsum("ib,ib->b", bra.conj(), ket)
@@ -98,7 +150,7 @@ def is_normalized(state: Tensor, atol: float = ATOL) -> bool:
     Returns:
         True if normalized, False otherwise.
     """
-    n_qubits = len(state.size()) - 1
+    n_qubits = state.ndim - 1
     batch_size = state.size()[-1]
     state = state.reshape((2**n_qubits, batch_size))
     sum_probs = (state.abs() ** 2).sum(dim=0)
@@ -259,7 +311,7 @@ def density_mat(state: Tensor) -> DensityMatrix:
     Returns:
         Tensor: The density matrix :math:`\\rho = |\psi \\rangle \\langle\\psi|`.
     """
-    n_qubits = len(state.size()) - 1
+    n_qubits = state.ndim - 1
     batch_size = state.shape[-1]
     state = state.reshape(2**n_qubits, batch_size)
     return DensityMatrix(torch.einsum("ib,jb->ijb", (state, state.conj())))
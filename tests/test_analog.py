@@ -29,10 +29,17 @@ from pyqtorch.utils import (
 pi = torch.tensor(torch.pi)
 
 
+# Z⊗Z⊗Z⊗Z is diagonal with entries (-1)**parity(i), so it is written out directly.
+HAMILTONIAN_ZZZZ = torch.diag(
+    torch.tensor(
+        [1, -1, -1, 1, -1, 1, 1, -1, -1, 1, 1, -1, 1, -1, -1, 1],
+        dtype=DEFAULT_MATRIX_DTYPE,
+    )
+)
+
+
 def Hamiltonian(batch_size: int = 1) -> torch.Tensor:
-    sigmaz = torch.diag(torch.tensor([1.0, -1.0], dtype=DEFAULT_MATRIX_DTYPE))
-    Hbase = torch.kron(sigmaz, sigmaz)
-    H = torch.kron(Hbase, Hbase)
+    H = HAMILTONIAN_ZZZZ.clone()
     if batch_size == 1:
         return H
     elif batch_size == 2:
@@ -42,27 +49,17 @@ def Hamiltonian(batch_size: int = 1) -> torch.Tensor:
 
 
 def Hamiltonian_general(n_qubits: int = 2, batch_size: int = 1) -> torch.Tensor:
-    H_batch = torch.zeros(
-        (2**n_qubits, 2**n_qubits, batch_size), dtype=DEFAULT_MATRIX_DTYPE
+    H_0 = torch.randn(
+        (batch_size, 2**n_qubits, 2**n_qubits), dtype=DEFAULT_MATRIX_DTYPE
     )
-    for i in range(batch_size):
-        H_0 = torch.randn((2**n_qubits, 2**n_qubits), dtype=DEFAULT_MATRIX_DTYPE)
-        H = (H_0 + torch.conj(H_0.transpose(0, 1))).to(DEFAULT_MATRIX_DTYPE)
-        H_batch[..., i] = H
-    return H_batch
+    H = H_0 + H_0.conj().transpose(-1, -2)
+    return H.permute(1, 2, 0).contiguous()
 
 
 def Hamiltonian_diag(n_qubits: int = 2, batch_size: int = 1) -> torch.Tensor:
-    H_batch = torch.zeros(
-        (2**n_qubits, 2**n_qubits, batch_size), dtype=DEFAULT_MATRIX_DTYPE
-    )
-    for i in range(batch_size):
-        H_0 = torch.randn((2**n_qubits, 2**n_qubits), dtype=DEFAULT_MATRIX_DTYPE)
-        H = H_0 + torch.conj(H_0.transpose(0, 1))
-        get_diag = torch.diag(H)
-        H_diag = torch.diag(get_diag)
-        H_batch[..., i] = H_diag
-    return H_batch
+    H = Hamiltonian_general(n_qubits, batch_size)
+    H_diag = torch.diag_embed(torch.diagonal(H, dim1=0, dim2=1))
+    return H_diag.permute(1, 2, 0).contiguous()
 
 
 @pytest.mark.flaky(max_runs=5)
@@ -397,3 +394,16 @@ def test_hamevo_endianness_cnot() -> None:
     cnot_op = pyq.CNOT(0, 1)
     wf_cnot = cnot_op(state_10)
     assert torch.allclose(wf_cnot, wf_hamevo, rtol=RTOL, atol=ATOL)
+
+
+@pytest.mark.parametrize("dtype", [torch.float16, torch.bfloat16])
+def test_hamevo_real_state(dtype: torch.dtype) -> None:
+    n_qubits = 2
+    generator = pyq.Add([pyq.Scale(pyq.X(0), "x"), pyq.Scale(pyq.Z(1), "z")])
+    hamevo = pyq.HamiltonianEvolution(generator, "t", (0, 1), True)
+    values = {"x": torch.rand(1), "z": torch.rand(1), "t": torch.rand(1)}
+    state = pyq.random_state(n_qubits)
+    wf_real = hamevo(torch.view_as_real(state).to(dtype), values)
+    assert wf_real.dtype == dtype
+    wf_real = torch.view_as_complex(wf_real.to(torch.float64).contiguous())
+    assert torch.allclose(wf_real, hamevo(state, values), atol=2e-2)
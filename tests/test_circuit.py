@@ -8,7 +8,7 @@ from torch import Tensor
 
 import pyqtorch as pyq
 from pyqtorch import DiffMode, expectation, run, sample
-from pyqtorch.circuit import QuantumCircuit
+from pyqtorch.circuit import FusedPrimitives, QuantumCircuit, hea
 from pyqtorch.matrices import COMPLEX_TO_REAL_DTYPES
 from pyqtorch.noise import Noise
 from pyqtorch.parametric import Parametric
@@ -186,6 +186,64 @@ def test_add() -> None:
     assert torch.allclose(pyq.Add(ops)(state), ops[0](state) + ops[1](state))
 
 
+def test_skip_identities() -> None:
+    n_qubits = 3
+    ops = [pyq.H(0), pyq.I(1), pyq.CNOT(0, 1), pyq.I(2)]
+    circ = pyq.QuantumCircuit(n_qubits, ops)
+    state = pyq.random_state(n_qubits)
+    assert len(circ) == len(ops)
+    assert circ.qubit_support == (0, 1, 2)
+    assert torch.allclose(circ(state), ops[2](ops[0](state)))
+    add = pyq.Add([pyq.I(0), pyq.X(0)])
+    assert torch.allclose(add(state), state + pyq.X(0)(state))
+    calls = []
+    ops[1].register_forward_hook(lambda *args: calls.append(args))
+    circ(state)
+    assert len(calls) == 1
+
+
+def test_modified_operations() -> None:
+    circ = pyq.QuantumCircuit(2, [pyq.X(0)])
+    state = pyq.zero_state(2)
+    circ(state)
+    circ.operations.append(pyq.X(1))
+    assert torch.allclose(circ(state), pyq.product_state("11"))
+    circ.operations.insert(0, pyq.I(0))
+    circ.operations[1] = pyq.I(0)
+    assert torch.allclose(circ(state), pyq.product_state("01"))
+
+
+@pytest.mark.parametrize("n_qubits", [2, 6])
+@pytest.mark.parametrize("batch_size", [1, 2])
+def test_fused_primitives(n_qubits: int, batch_size: int) -> None:
+    ops = [pyq.H(i) for i in range(n_qubits)] + [pyq.CNOT(0, 1)]
+    ops += [pyq.X(0), pyq.X(0), pyq.RX(1, "theta"), pyq.T(0), pyq.T(1)]
+    circ = pyq.QuantumCircuit(n_qubits, ops)
+    assert any(isinstance(op, FusedPrimitives) for op in circ._forward_ops)
+    state = pyq.random_state(n_qubits, batch_size)
+    values = {"theta": torch.rand(batch_size)}
+    expected = state
+    for op in ops:
+        expected = op(expected, values)
+    assert torch.allclose(circ(state, values), expected)
+
+
+def test_fused_primitives_hooks() -> None:
+    calls = []
+    ops = [pyq.X(0), pyq.X(1), pyq.X(2)]
+    circ = pyq.QuantumCircuit(3, ops)
+    ops[1].register_forward_hook(lambda *args: calls.append(args))
+    circ(pyq.zero_state(3))
+    assert len(calls) == 1
+    assert not any(isinstance(op, FusedPrimitives) for op in circ._forward_ops)
+    circ = pyq.QuantumCircuit(3, [pyq.X(0), pyq.X(1)])
+    assert isinstance(circ._forward_ops[0], FusedPrimitives)
+    circ.operations[0].register_forward_pre_hook(lambda *args: calls.append(args))
+    wf = circ(pyq.zero_state(3))
+    assert len(calls) == 2
+    assert torch.allclose(wf, pyq.product_state("110"))
+
+
 def test_merge() -> None:
     ops = [pyq.RX(0, "theta_0"), pyq.RY(0, "theta_1"), pyq.RX(0, "theta_2")]
     circ = pyq.QuantumCircuit(2, ops)
@@ -310,3 +368,30 @@ def test_sample_run() -> None:
     assert torch.allclose(wf, product_state("1100"))
     assert torch.allclose(pyq.QuantumCircuit(4, [pyq.I(0)]).run("1100"), wf)
     assert "1100" in samples[0]
+
+
+@pytest.mark.parametrize("dtype", [torch.float16, torch.bfloat16])
+def test_real_state_composite(dtype: torch.dtype) -> None:
+    n_qubits = 3
+    ops, params = hea(n_qubits, 2, "theta")
+    ops = list(ops) + [
+        pyq.Scale(pyq.X(1), "scale"),
+        pyq.Add([pyq.Z(0), pyq.Y(2)]),
+    ]
+    circ = pyq.QuantumCircuit(n_qubits, ops)
+    obs = pyq.Observable(n_qubits, [pyq.Z(0), pyq.X(2)])
+    values = {**params, "scale": torch.rand(1)}
+    state = pyq.random_state(n_qubits, 2)
+    state_real = torch.view_as_real(state).to(dtype)
+    wf_real = circ(state_real, values)
+    assert wf_real.dtype == dtype
+    wf_real_complex = torch.view_as_complex(wf_real.to(torch.float64).contiguous())
+    assert torch.allclose(wf_real_complex, circ(state, values), atol=5e-2)
+    assert torch.allclose(
+        obs(wf_real, values).to(torch.float64),
+        obs(circ(state, values), values),
+        atol=5e-2,
+    )
+    diagonal_obs = pyq.DiagonalObservable(n_qubits, [pyq.Z(0)])
+    with pytest.raises(TypeError, match="does not support states of dtype"):
+        diagonal_obs(wf_real, values)
@@ -1,8 +1,10 @@
 from __future__ import annotations
 
+import gc
 import random
 from math import log2
-from typing import Callable, Tuple
+from types import SimpleNamespace
+from typing import Any, Callable, Tuple
 
 import pytest
 import torch
@@ -10,6 +12,7 @@ from conftest import _calc_mat_vec_wavefunction
 from torch import Tensor
 
 import pyqtorch as pyq
+from pyqtorch import _custatevec_backend as custatevec
 from pyqtorch.apply import apply_operator, operator_product
 from pyqtorch.matrices import (
     DEFAULT_MATRIX_DTYPE,
@@ -18,6 +21,7 @@ from pyqtorch.matrices import (
     XMAT,
     YMAT,
     ZMAT,
+    _controlled,
     _dagger,
 )
 from pyqtorch.noise import (
@@ -27,7 +31,18 @@ from pyqtorch.noise import (
     PhaseDamping,
 )
 from pyqtorch.parametric import Parametric
-from pyqtorch.primitive import H, I, Primitive, S, T, X, Y, Z
+from pyqtorch.primitive import (
+    _WEAK_PAULI_POOL,
+    ControlledOperationGate,
+    H,
+    I,
+    Primitive,
+    S,
+    T,
+    X,
+    Y,
+    Z,
+)
 from pyqtorch.utils import (
     ATOL,
     RTOL,
@@ -608,3 +623,251 @@ def test_parametric_constantparam(gate: pyq.parametric.Parametric) -> None:
         gate(target, "theta")(state, {"theta": param_val}),
         gate(target, param_val)(state),
     )
+
+
+@pytest.mark.parametrize("gate", [X, Y, Z, H, T, S])
+def test_shared_pauli(gate: Primitive) -> None:
+    block_0, block_1 = gate(0), gate(1)
+    assert block_0.pauli is block_1.pauli
+    block_0.to(torch.complex64)
+    assert block_0.pauli.dtype == torch.complex64
+    assert block_1.pauli.dtype == DEFAULT_MATRIX_DTYPE
+    assert block_0.pauli is gate(2).to(torch.complex64).pauli
+    assert "pauli" not in block_0.state_dict()
+
+
+def test_load_legacy_state_dict() -> None:
+    ops = [X(0), pyq.RX(1, "theta"), pyq.CNOT(0, 1), Primitive(ZMAT, 1)]
+    circ = pyq.QuantumCircuit(2, ops)
+    assert len(circ.state_dict()) == 0
+    # Previous versions saved the matrices of all gates and the identity of Parametric.
+    legacy_state_dict = {f"operations.{i}.pauli": op.pauli for i, op in enumerate(ops)}
+    legacy_state_dict["operations.1.identity"] = IMAT
+    circ.load_state_dict(legacy_state_dict)
+    assert torch.equal(circ.operations[3].pauli, ZMAT)
+
+
+def test_projector_pool() -> None:
+    block_0 = pyq.Projector((0, 1, 2), ket="011", bra="110")
+    block_1 = pyq.Projector((1, 2, 3), ket="011", bra="110")
+    assert block_0.pauli is block_1.pauli
+    assert block_0.pauli_re.data_ptr() == block_1.pauli_re.data_ptr()
+    assert block_0.pauli_im.data_ptr() == block_1.pauli_im.data_ptr()
+    assert block_0.pauli_re.untyped_storage().data_ptr() == (
+        block_0.pauli.untyped_storage().data_ptr()
+    )
+    block_1.to(torch.complex64)
+    key = ("PROJ_011_110", torch.device("cpu"), DEFAULT_MATRIX_DTYPE)
+    assert key in _WEAK_PAULI_POOL
+    del block_0, block_1
+    gc.collect()
+    assert key not in _WEAK_PAULI_POOL
+    assert (
+        "PROJ_011_110",
+        torch.device("cpu"),
+        torch.complex64,
+    ) not in _WEAK_PAULI_POOL
+
+
+@pytest.mark.parametrize("gate", [X, Y, Z, H, T, S, pyq.SDagger, pyq.N])
+@pytest.mark.parametrize("dtype", [torch.complex64, torch.complex128])
+@pytest.mark.parametrize("n_qubits", [1, 3])
+def test_fast_apply(gate: Primitive, dtype: torch.dtype, n_qubits: int) -> None:
+    pytest.importorskip("numba")
+    target = torch.randint(0, n_qubits, (1,)).item()
+    block = gate(target).to(dtype)
+    assert block._fast_kernel is not None
+    state = pyq.random_state(n_qubits, batch_size=2).to(dtype)
+    expected = apply_operator(state, block.unitary(), block.qubit_support)
+    wf_pyq = block(state)
+    assert wf_pyq.dtype == dtype
+    assert torch.allclose(wf_pyq, expected, rtol=RTOL, atol=ATOL)
+
+
+def test_fast_apply_vmap() -> None:
+    block = H(0)
+    state = pyq.random_state(3, batch_size=4)
+    wf_vmap = torch.vmap(
+        lambda x: block(x.unsqueeze(-1)).squeeze(-1), in_dims=-1, out_dims=-1
+    )(state)
+    assert torch.allclose(wf_vmap, block(state), rtol=RTOL, atol=ATOL)
+
+
+def test_fast_apply_forward_ad() -> None:
+    block = H(0)
+    state, tangent = pyq.random_state(3), pyq.random_state(3)
+    with torch.autograd.forward_ad.dual_level():
+        dual_state = torch.autograd.forward_ad.make_dual(state, tangent)
+        wf_tangent = torch.autograd.forward_ad.unpack_dual(block(dual_state)).tangent
+    assert wf_tangent is not None
+    assert torch.allclose(wf_tangent, block(tangent), rtol=RTOL, atol=ATOL)
+
+
+@pytest.mark.parametrize("n_qubits", [2, 3, 5])
+@pytest.mark.parametrize("batch_size", [1, 3])
+def test_apply_controlled(n_qubits: int, batch_size: int) -> None:
+    qubits = random.sample(range(n_qubits), n_qubits)
+    controls, target = tuple(qubits[:-1]), qubits[-1]
+    thetas = torch.rand(batch_size)
+    operator = pyq.RX(target).unitary(thetas)
+    state = pyq.random_state(n_qubits)
+    full_operator = _controlled(operator, batch_size, len(controls))
+    expected = apply_operator(state, full_operator, controls + (target,))
+    wf_pyq = apply_operator(state, operator, (target,), controls=controls)
+    assert torch.allclose(wf_pyq, expected, rtol=RTOL, atol=ATOL)
+    toffoli = pyq.Toffoli(controls, target)
+    assert torch.allclose(
+        toffoli(state), apply_operator(state, toffoli.unitary(), toffoli.qubit_support)
+    )
+
+
+def test_static_primitive_hooks() -> None:
+    calls = []
+    block = X(0)
+    state = pyq.random_state(2)
+    assert torch.allclose(block(state), block.forward(state))
+    block.register_forward_hook(lambda *args: calls.append(args))
+    block(state)
+    assert len(calls) == 1
+    handle = torch.nn.modules.module.register_module_forward_hook(
+        lambda *args: calls.append(args)
+    )
+    try:
+        Y(0)(state)
+    finally:
+        handle.remove()
+    assert len(calls) == 2
+
+
+@pytest.mark.parametrize("dtype", [torch.float16, torch.bfloat16])
+def test_real_state(dtype: torch.dtype) -> None:
+    n_qubits = 3
+    ops = [
+        pyq.H(0),
+        pyq.Y(1),
+        pyq.T(2),
+        pyq.CNOT(0, 2),
+        pyq.RX(1, "theta"),
+        pyq.Toffoli((0, 1), 2),
+        Primitive(pyq.CY(0, 1).tensor(n_qubits=2).squeeze(2), 1, qubit_support=(1, 2)),
+    ]
+    # Generic matrices are split into real and imaginary parts on use only.
+    assert not hasattr(ops[-1], "pauli_re")
+    circ = pyq.QuantumCircuit(n_qubits, ops)
+    values = {"theta": torch.rand(2)}
+    state = pyq.random_state(n_qubits, 2)
+    wf_real = circ(torch.view_as_real(state).to(dtype), values)
+    assert wf_real.dtype == dtype
+    wf_real = torch.view_as_complex(wf_real.to(torch.float64).contiguous())
+    assert torch.allclose(wf_real, circ(state, values), atol=1e-2)
+
+
+def test_compile_forward() -> None:
+    block = H(0)
+    state = pyq.random_state(2)
+    compiled_forward = block.compile_forward()
+    assert block.compile_forward() is compiled_forward
+    assert torch.allclose(compiled_forward(state), block(state))
+    block.to(torch.complex64)
+    assert block.compile_forward() is not compiled_forward
+
+
+def test_controlled_unitary_cache() -> None:
+    block_0, block_1 = pyq.CNOT(0, 1), pyq.CNOT(2, 0)
+    assert block_0.unitary() is block_1.unitary()
+    assert block_0.dagger() is block_0.dagger()
+    assert torch.allclose(block_0.dagger(), _dagger(block_0.unitary()))
+    block_0.to(torch.complex64)
+    assert block_0.unitary().dtype == block_0.dagger().dtype == torch.complex64
+    assert block_1.unitary().dtype == DEFAULT_MATRIX_DTYPE
+
+
+class _FakeCuStateVec:
+    """Records the arguments passed to `custatevec.apply_matrix`."""
+
+    MatrixLayout = SimpleNamespace(ROW="ROW", COL="COL")
+
+    def __init__(self) -> None:
+        self.calls: list[tuple] = []
+
+    def set_stream(self, handle: int, stream: int) -> None:
+        pass
+
+    def apply_matrix_get_workspace_size(self, *args: Any) -> int:
+        return 0
+
+    def apply_matrix(self, *args: Any) -> None:
+        self.calls.append(args)
+
+
+@pytest.mark.parametrize(
+    "block, n_qubits, target_bits, control_bits",
+    [
+        (pyq.SWAP(0, 2), 3, [0, 2], []),
+        (pyq.Projector((1, 2), ket="01", bra="10"), 4, [1, 2], []),
+        (pyq.Toffoli((0, 1), 3), 4, [0], [3, 2]),
+        (pyq.CY(2, 0), 3, [2], [0]),
+    ],
+)
+def test_custatevec_arguments(
+    monkeypatch: pytest.MonkeyPatch,
+    block: Primitive,
+    n_qubits: int,
+    target_bits: list[int],
+    control_bits: list[int],
+) -> None:
+    cusv = _FakeCuStateVec()
+    cuquantum = SimpleNamespace(
+        custatevec=cusv,
+        cudaDataType=SimpleNamespace(CUDA_C_32F="C_32F", CUDA_C_64F="C_64F"),
+        ComputeType=SimpleNamespace(COMPUTE_32F="32F", COMPUTE_64F="64F"),
+    )
+    monkeypatch.setattr(custatevec, "_custatevec", lambda: cuquantum)
+    monkeypatch.setattr(custatevec, "_handle", lambda device: 1)
+    monkeypatch.setattr(
+        torch.cuda, "current_stream", lambda device: SimpleNamespace(cuda_stream=0)
+    )
+    state = pyq.random_state(n_qubits)
+    if isinstance(block, ControlledOperationGate):
+        targets, controls = (block.target,), block.control
+        operator = Primitive.unitary(block)
+    else:
+        targets, controls = block.qubit_support, ()
+        operator = block.unitary()
+    custatevec.apply(state, operator, targets, controls)
+    ((*args,),) = cusv.calls
+    assert args[2:4] == ["C_64F", n_qubits]
+    assert args[5:8] == ["C_64F", "ROW", 0]
+    assert args[8:13] == [
+        target_bits,
+        len(target_bits),
+        control_bits,
+        0,
+        len(control_bits),
+    ]
+    assert args[13] == "64F"
+
+
+@pytest.mark.parametrize(
+    "block",
+    [
+        pyq.H(1),
+        pyq.SWAP(0, 2),
+        pyq.Projector((1, 2), ket="01", bra="10"),
+        pyq.Toffoli((0, 1), 3),
+        pyq.CY(2, 0),
+    ],
+)
+@pytest.mark.parametrize("dtype", [torch.complex64, torch.complex128])
+def test_custatevec_apply(block: Primitive, dtype: torch.dtype) -> None:
+    pytest.importorskip("cuquantum")
+    if not torch.cuda.is_available():
+        pytest.skip("cuStateVec requires a CUDA device.")
+    state = pyq.random_state(4).to(dtype)
+    block = block.to(dtype)
+    expected = apply_operator(state, block.unitary(), block.qubit_support)
+    cuda_state = state.to("cuda")
+    assert custatevec.can_apply(cuda_state, Primitive.unitary(block.to("cuda")))
+    wf_cuda = block(cuda_state)
+    assert wf_cuda.is_cuda
+    assert torch.allclose(wf_cuda.cpu(), expected, rtol=RTOL, atol=1e-5)